@@ -0,0 +1,234 @@
+# __test__/test_catalogOverlay.py
+# Unit tests for per-school catalog overlays (src/rec-system/catalogOverlay.py).
+# Run with: python -m pytest __test__/test_catalogOverlay.py
+
+import copy
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "rec-system"))
+
+from catalogOverlay import (  # noqa: E402
+    OVERLAYS_DIR,
+    CatalogBase,
+    CatalogRegistry,
+    LayeredCatalog,
+    load_overlay,
+    overlay_from_dict,
+    thaw,
+)
+from recSys import (  # noqa: E402
+    get_recommendations_for_user,
+    load_careers,
+    load_games_as_units,
+    load_users,
+    load_videos,
+    normalize_video,
+)
+
+
+# 1. Small controlled base
+def make_base() -> CatalogBase:
+    games = [
+        {"id": "game.001", "title": "Cells", "kind": "game", "difficulty": 1,
+         "knowledge_nodes": [{"id": "BIO.Y3.AC9S3U01", "weight": 1.0}], "progress_effects": {}},
+        {"id": "game.002", "title": "Forces", "kind": "game", "difficulty": 2,
+         "knowledge_nodes": [{"id": "PHYS.Y4.AC9S4U03", "weight": 1.0}], "progress_effects": {}},
+    ]
+    careers = [
+        {"id": "career.001", "title": "Marine Biologist", "min_skill_levels": {"QP": 5},
+         "required_knowledge": [{"node": "BIO.Y3.AC9S3U01", "min_level": 1, "weight": 1.0}],
+         "threshold": 1.5, "discipline": None},
+        {"id": "career.002", "title": "Physicist", "min_skill_levels": {"PAD": 4},
+         "required_knowledge": [], "threshold": 2, "discipline": None},
+    ]
+    videos = [
+        {"id": "video.001", "title": "Reef dive", "discipline": "Biological Sciences",
+         "career_id": "career.001", "video_url": None},
+    ]
+    return CatalogBase(games, careers, videos)
+
+
+SCHOOL_A = {
+    "disabled": {"games": ["game.002"]},
+    "added": {"videos": [{"id": "a.video.001", "title": "Local pond", "discipline": "Biological Sciences"}]},
+    "patched": {"careers": {"career.001": {"threshold": 1.0, "min_skill_levels": {"QP": 2}}}},
+}
+
+
+# 2. Sharing and copy-on-write
+def test_empty_overlay_returns_base_tuples_and_indexes():
+    base = make_base()
+    cat = LayeredCatalog(base, overlay_from_dict("plain", {}))
+    for kind in ("games", "careers", "videos"):
+        assert cat.records(kind) is base.records(kind)
+        assert cat.index(kind) is base.index(kind)
+
+
+def test_disable_add_and_patch_resolve():
+    base = make_base()
+    cat = LayeredCatalog(base, overlay_from_dict("school-a", SCHOOL_A))
+
+    assert [g["id"] for g in cat.games()] == ["game.001"]
+    assert cat.get("games", "game.002") is None
+    assert [v["id"] for v in cat.videos()] == ["video.001", "a.video.001"]
+    assert cat.get("videos", "a.video.001")["title"] == "Local pond"
+
+    patched = cat.get("careers", "career.001")
+    assert patched["threshold"] == 1.0
+    assert dict(patched["min_skill_levels"]) == {"QP": 2}
+    assert base.index("careers")["career.001"]["threshold"] == 1.5
+
+
+def test_untouched_records_are_shared_and_cached():
+    base = make_base()
+    cat = LayeredCatalog(base, overlay_from_dict("school-a", SCHOOL_A))
+
+    assert cat.get("careers", "career.002") is base.index("careers")["career.002"]
+    assert cat.get("videos", "video.001") is base.index("videos")["video.001"]
+    assert cat.careers() is cat.careers()
+    assert cat.index("careers") is cat.index("careers")
+
+
+def test_records_are_read_only():
+    base = make_base()
+    cat = LayeredCatalog(base, overlay_from_dict("school-a", SCHOOL_A))
+
+    with pytest.raises(TypeError):
+        cat.get("careers", "career.002")["threshold"] = 99
+    with pytest.raises(TypeError):
+        cat.get("careers", "career.001")["min_skill_levels"]["QP"] = 0
+    with pytest.raises(TypeError):
+        base.index("games")["game.001"]["knowledge_nodes"][0]["weight"] = 0
+    assert base.index("careers")["career.001"]["min_skill_levels"]["QP"] == 5
+
+
+def test_recommend_matches_plain_recommender_for_empty_overlay():
+    base = CatalogBase.from_loaders()
+    cat = LayeredCatalog(base, overlay_from_dict("plain", {}))
+    user = load_users()[0]
+
+    expected = get_recommendations_for_user(user, load_games_as_units(), load_careers(), load_videos())
+    got = cat.recommend(user)
+    assert got["recommendations"] == expected["recommendations"]
+
+
+def test_recommend_matches_hand_edited_lists_for_all_users():
+    raw_video = {"id": "local.video.001", "title": "Rockpool survey",
+                 "discipline": "Biological Sciences", "career_id": "career.001"}
+    patch = {"threshold": 0.5, "min_skill_levels": {"QP": 1, "PC": 1}}
+    cat = LayeredCatalog(CatalogBase.from_loaders(), overlay_from_dict("school-a", {
+        "disabled": {"games": ["game.001"], "careers": ["career.002"]},
+        "added": {"videos": [raw_video]},
+        "patched": {"careers": {"career.001": patch}},
+    }))
+
+    games = [g for g in load_games_as_units() if g["id"] != "game.001"]
+    careers = [c for c in load_careers() if c["id"] != "career.002"]
+    for c in careers:
+        if c["id"] == "career.001":
+            c.update(copy.deepcopy(patch))
+    videos = load_videos() + [normalize_video(raw_video, 0)]
+
+    users = load_users()
+    assert users
+    for user in users:
+        expected = get_recommendations_for_user(user, games, careers, videos)
+        assert cat.recommend(user)["recommendations"] == expected["recommendations"], user["id"]
+
+
+# 3. Validation
+@pytest.mark.parametrize("raw", [
+    {"disabled": {"games": "game.001"}},
+    {"disabled": {"lessons": ["x"]}},
+    {"added": {"videos": {"id": "x"}}},
+    {"added": [{"id": "x"}]},
+    {"added": {"videos": [{"title": "no id"}]}},
+    {"patched": {"careers": ["career.001"]}},
+    {"patched": {"careers": {"career.001": 2}}},
+    {"disable": {"games": ["game.001"]}},
+    {"patches": {"careers": {}}},
+    {"disabled": {"games": [5]}},
+    {"added": {"games": [{"id": 5, "title": "Numbered"}]}},
+])
+def test_malformed_overlay_is_rejected(raw):
+    with pytest.raises(ValueError, match="bad-school"):
+        overlay_from_dict("bad-school", raw)
+
+
+@pytest.mark.parametrize("raw", [
+    {"disabled": {"games": ["game.999"]}},
+    {"patched": {"careers": {"career.999": {"threshold": 1}}}},
+    {"patched": {"careers": {"career.001": {"id": "career.002"}}}},
+    {"patched": {"careers": {"career.001": {"treshold": 1}}}},
+    {"added": {"videos": [{"id": "video.001"}]}},
+    {"added": {"videos": [{"id": "dup"}, {"id": "dup"}]}},
+    {"patched": {"careers": {"career.001": {"threshold": "high"}}}},
+    {"patched": {"careers": {"career.001": {"min_skill_levels": {"QP": "x"}}}}},
+    {"patched": {"careers": {"career.001": {"required_knowledge": [{"min_level": 1}]}}}},
+    {"patched": {"games": {"game.001": {"knowledge_nodes": ["BIO.Y3.AC9S3U01"]}}}},
+    {"patched": {"games": {"game.001": {"progress_effects": {"knowledge": {"node": "X"}}}}}},
+    {"patched": {"games": {"game.001": {"kind": "video"}}}},
+    {"patched": {"videos": {"video.001": {"discipline": ["Biological Sciences"]}}}},
+    {"added": {"careers": [{"id": "career.900", "title": "Astronaut", "threshold": "1"}]}},
+])
+def test_overlay_inconsistent_with_base_is_rejected(raw):
+    with pytest.raises(ValueError, match="bad-school"):
+        LayeredCatalog(make_base(), overlay_from_dict("bad-school", raw))
+
+
+def test_game_knowledge_nodes_can_be_patched():
+    cat = LayeredCatalog(make_base(), overlay_from_dict("school-a", {
+        "patched": {"games": {"game.001": {"knowledge_nodes": [{"id": "EARTH.Y5.AC9S5U01", "weight": 1.0}]}}},
+    }))
+    assert cat.get("games", "game.001")["knowledge_nodes"][0]["id"] == "EARTH.Y5.AC9S5U01"
+
+
+def test_real_base_records_pass_record_checks():
+    # the checks applied to overlay records must accept what the loaders produce
+    from catalogOverlay import KINDS, _record_problem
+    base = CatalogBase.from_loaders()
+    assert not [(k, r["id"]) for k in KINDS for r in base.records(k) if _record_problem(k, r)]
+
+
+def test_overlay_is_not_hashable_by_value():
+    overlay = overlay_from_dict("school-a", SCHOOL_A)
+    assert overlay != overlay_from_dict("school-a", SCHOOL_A)
+    assert hash(overlay) == hash(overlay)
+
+
+# 4. Serialization
+def test_thaw_makes_records_json_serializable():
+    cat = LayeredCatalog(make_base(), overlay_from_dict("school-a", SCHOOL_A))
+    with pytest.raises(TypeError):
+        json.dumps(cat.get("careers", "career.001"))
+
+    out = json.loads(json.dumps(thaw(cat.careers())))
+    assert out[0]["min_skill_levels"] == {"QP": 2}
+    assert out[0]["required_knowledge"] == [{"node": "BIO.Y3.AC9S3U01", "min_level": 1, "weight": 1.0}]
+    assert thaw(cat.get("games", "game.001"))["knowledge_nodes"] == [{"id": "BIO.Y3.AC9S3U01", "weight": 1.0}]
+
+
+# 5. Registry
+def test_registry_only_serves_registered_schools():
+    registry = CatalogRegistry(make_base())
+    registry.register(overlay_from_dict("school-a", SCHOOL_A))
+
+    assert registry.for_school("school-a") is registry.for_school("school-a")
+    assert registry.for_school(None).games() is registry.base.records("games")
+    with pytest.raises(KeyError):
+        registry.for_school("school-b")
+
+
+def test_example_overlay_file_applies_to_real_catalog():
+    overlay = load_overlay(OVERLAYS_DIR / "example_school.json")
+    registry = CatalogRegistry.from_dir()
+    cat = registry.for_school(overlay.school_id)
+
+    assert "example_school" in registry.schools()
+    assert cat.get("games", "game.002") is None
+    assert cat.get("videos", "example_school.video.001") is not None
+    assert cat.get("careers", "career.001")["threshold"] == 1.0
@@ -0,0 +1,398 @@
+# src/rec-system/catalogOverlay.py
+#
+# Per-school catalog customization without copying the catalog.
+#
+# One CatalogBase is built from the recSys.py loaders and shared by every
+# school. Each school only keeps a small CatalogOverlay (disabled ids, added
+# records, patched fields). LayeredCatalog resolves base + overlay when a
+# list or record is first asked for, and caches the result for that overlay.
+# Untouched records are shared by reference with the base; only patched
+# careers/games/videos get their own copy. Every record is deep-frozen
+# (mappings -> MappingProxyType, lists -> tuples), so no school can change
+# what the others see.
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from recSys import (
+    DATA_DIR,
+    game_to_unit,
+    get_recommendations_for_user,
+    load_careers,
+    load_games_as_units,
+    load_json,
+    load_videos,
+    normalize_career,
+    normalize_video,
+)
+
+# 0. Path settings
+OVERLAYS_DIR = DATA_DIR / "overlays"   # one <school_id>.json per school
+
+KINDS = ("games", "careers", "videos")
+
+Record = Mapping[str, Any]
+
+
+def freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Inverse of freeze: plain dicts and lists, e.g. for json.dumps."""
+    if isinstance(value, Mapping):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(v) for v in value]
+    if isinstance(value, frozenset):
+        return sorted(thaw(v) for v in value)
+    return value
+
+
+# 1. Shared immutable base
+class CatalogBase:
+    """
+    The catalog every school starts from. Built once per process.
+    Records are frozen here and shared with every LayeredCatalog.
+    """
+
+    def __init__(self, games: List[Dict[str, Any]], careers: List[Dict[str, Any]], videos: List[Dict[str, Any]]):
+        self._records: Dict[str, Tuple[Record, ...]] = {
+            "games": tuple(freeze(r) for r in games),
+            "careers": tuple(freeze(r) for r in careers),
+            "videos": tuple(freeze(r) for r in videos),
+        }
+        self._index: Dict[str, Mapping[str, Record]] = {
+            kind: MappingProxyType({r["id"]: r for r in recs})
+            for kind, recs in self._records.items()
+        }
+
+    @classmethod
+    def from_loaders(cls) -> "CatalogBase":
+        return cls(load_games_as_units(), load_careers(), load_videos())
+
+    def records(self, kind: str) -> Tuple[Record, ...]:
+        return self._records[kind]
+
+    def index(self, kind: str) -> Mapping[str, Record]:
+        return self._index[kind]
+
+
+# 2. Per-school overlay diff
+@dataclass(frozen=True, eq=False)
+class CatalogOverlay:
+    """
+    What one school changes on top of the base, per kind ("games" / "careers" / "videos"):
+      disabled: ids hidden for this school
+      added:    extra records, normalized like the loaders' output and frozen
+      patched:  id -> frozen fields that replace the base values (e.g. threshold, min_skill_levels)
+    Everything is frozen on construction; load_overlay / overlay_from_dict also check the JSON shape.
+    """
+    school_id: str
+    disabled: Mapping[str, frozenset] = field(default_factory=dict)
+    added: Mapping[str, Tuple[Record, ...]] = field(default_factory=dict)
+    patched: Mapping[str, Mapping[str, Record]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        object.__setattr__(self, "disabled", MappingProxyType({k: frozenset(v) for k, v in self.disabled.items()}))
+        object.__setattr__(self, "added", freeze(self.added))
+        object.__setattr__(self, "patched", freeze(self.patched))
+
+    def is_empty(self, kind: str) -> bool:
+        return not (self.disabled.get(kind) or self.added.get(kind) or self.patched.get(kind))
+
+
+_NORMALIZERS: Dict[str, Callable[[Any, int], Record]] = {
+    "games": lambda raw, idx: game_to_unit(raw),
+    "careers": lambda raw, idx: normalize_career(raw),
+    "videos": normalize_video,
+}
+
+
+# Fields a patch may replace: whatever the normalizer produces, except the id.
+# For games, "kind" is fixed and "progress_effects" is only the raw source of
+# knowledge_nodes, so schools patch knowledge_nodes directly.
+_UNPATCHABLE: Dict[str, frozenset] = {
+    "games": frozenset({"id", "kind", "progress_effects"}),
+    "careers": frozenset({"id"}),
+    "videos": frozenset({"id"}),
+}
+PATCHABLE_FIELDS: Dict[str, frozenset] = {
+    kind: frozenset(norm({}, 0)) - _UNPATCHABLE[kind] for kind, norm in _NORMALIZERS.items()
+}
+
+OVERLAY_SECTIONS = ("disabled", "added", "patched")
+
+
+def _is_number(x: Any) -> bool:
+    return isinstance(x, (int, float)) and not isinstance(x, bool)
+
+
+def _is_optional_str(x: Any) -> bool:
+    return x is None or isinstance(x, str)
+
+
+def _record_problem(kind: str, r: Record) -> Optional[str]:
+    """
+    Return why a resolved record would break the scoring code in recSys.py,
+    or None if it is fine. Only overlay-supplied (added / patched) records
+    are checked; the base comes from the loaders.
+    """
+    if not isinstance(r.get("title"), str):
+        return "'title' must be a string"
+
+    if kind == "careers":
+        if not _is_number(r.get("threshold")):
+            return "'threshold' must be a number"
+        msl = r.get("min_skill_levels")
+        if not isinstance(msl, Mapping) or not all(isinstance(k, str) and _is_number(v) for k, v in msl.items()):
+            return "'min_skill_levels' must map skill codes to numbers"
+        rk = r.get("required_knowledge")
+        if not isinstance(rk, (list, tuple)):
+            return "'required_knowledge' must be a list"
+        for item in rk:
+            if not isinstance(item, Mapping) or not isinstance(item.get("node"), str):
+                return "'required_knowledge' entries must be objects with a string 'node'"
+            if not all(_is_number(item[f]) for f in ("min_level", "weight") if f in item):
+                return "'required_knowledge' min_level / weight must be numbers"
+        disc = r.get("discipline")
+        if not (_is_optional_str(disc) or (isinstance(disc, (list, tuple)) and all(isinstance(d, str) for d in disc))):
+            return "'discipline' must be a string, a list of strings or null"
+
+    elif kind == "games":
+        if not (_is_number(r.get("difficulty")) or isinstance(r.get("difficulty"), str)):
+            return "'difficulty' must be a number or a level name"
+        kns = r.get("knowledge_nodes")
+        if not isinstance(kns, (list, tuple)):
+            return "'knowledge_nodes' must be a list"
+        for kn in kns:
+            if not isinstance(kn, Mapping) or not isinstance(kn.get("id"), str):
+                return "'knowledge_nodes' entries must be objects with a string 'id'"
+            if "weight" in kn and not _is_number(kn["weight"]):
+                return "'knowledge_nodes' weight must be a number"
+
+    elif kind == "videos":
+        for f in ("discipline", "career_id", "video_url"):
+            if not _is_optional_str(r.get(f)):
+                return f"'{f}' must be a string or null"
+
+    return None
+
+
+def _section(school_id: str, raw: Dict[str, Any], name: str) -> Dict[str, Any]:
+    sec = raw.get(name) or {}
+    if not isinstance(sec, dict):
+        raise ValueError(f"{school_id}: '{name}' must be an object keyed by kind, got {type(sec).__name__}")
+    unknown = set(sec) - set(KINDS)
+    if unknown:
+        raise ValueError(f"{school_id}: unknown catalog kind(s) in '{name}': {sorted(unknown)}")
+    return sec
+
+
+def overlay_from_dict(school_id: str, raw: Dict[str, Any]) -> CatalogOverlay:
+    """
+    Build an overlay from its JSON form:
+    {
+      "disabled": {"games": ["game.001"]},
+      "added":    {"videos": [{"id": "...", ...same shape as discipline_videos.json...}]},
+      "patched":  {"careers": {"career.001": {"threshold": 2, "min_skill_levels": {"QP": 1}}}}
+    }
+    Added records must carry their own string "id" and go through the same
+    normalizers as the base loaders. Patch fields (PATCHABLE_FIELDS) and the
+    value types of added / patched records are checked when the overlay is
+    put on top of a base.
+    """
+    if not isinstance(raw, dict):
+        raise ValueError(f"{school_id}: overlay must be an object, got {type(raw).__name__}")
+    unknown = set(raw) - set(OVERLAY_SECTIONS)
+    if unknown:
+        raise ValueError(f"{school_id}: unknown overlay section(s): {sorted(unknown)}, expected {list(OVERLAY_SECTIONS)}")
+
+    disabled: Dict[str, frozenset] = {}
+    for k, ids in _section(school_id, raw, "disabled").items():
+        if not isinstance(ids, list):
+            raise ValueError(f"{school_id}: disabled {k} must be a list of ids, got {type(ids).__name__}")
+        if not all(isinstance(i, str) for i in ids):
+            raise ValueError(f"{school_id}: disabled {k} ids must be strings: {ids!r}")
+        disabled[k] = frozenset(ids)
+
+    added: Dict[str, Tuple[Record, ...]] = {}
+    for k, recs in _section(school_id, raw, "added").items():
+        if not isinstance(recs, list):
+            raise ValueError(f"{school_id}: added {k} must be a list of records, got {type(recs).__name__}")
+        for r in recs:
+            if not isinstance(r, dict) or not isinstance(r.get("id"), str) or not r["id"]:
+                raise ValueError(f"{school_id}: every added {k} record must be an object with a string 'id': {r!r}")
+        added[k] = tuple(_NORMALIZERS[k](r, 0) for r in recs)
+
+    patched: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for k, patches in _section(school_id, raw, "patched").items():
+        if not isinstance(patches, dict):
+            raise ValueError(f"{school_id}: patched {k} must be an object of id -> fields, got {type(patches).__name__}")
+        for rid, fields in patches.items():
+            if not isinstance(fields, dict):
+                raise ValueError(f"{school_id}: patch for {k} '{rid}' must be an object, got {type(fields).__name__}")
+        patched[k] = {str(rid): fields for rid, fields in patches.items()}
+
+    return CatalogOverlay(school_id=school_id, disabled=disabled, added=added, patched=patched)
+
+
+def load_overlay(path: Path) -> CatalogOverlay:
+    return overlay_from_dict(path.stem, load_json(path))
+
+
+# 3. Base + overlay view, resolved lazily and cached
+class LayeredCatalog:
+    def __init__(self, base: CatalogBase, overlay: Optional[CatalogOverlay] = None):
+        self.base = base
+        self.overlay = overlay or CatalogOverlay(school_id="")
+        self._resolved: Dict[str, Tuple[Record, ...]] = {}
+        self._index: Dict[str, Mapping[str, Record]] = {}
+        self._validate()
+
+    def _validate(self):
+        school = self.overlay.school_id or "<base>"
+        for kind in KINDS:
+            base_ids = self.base.index(kind)
+            added_ids = [r.get("id") for r in self.overlay.added.get(kind, ())]
+            if not all(added_ids):
+                raise ValueError(f"{school}: every added {kind} record needs an 'id'")
+            known = set(base_ids) | set(added_ids)
+
+            missing = (set(self.overlay.disabled.get(kind, ())) | set(self.overlay.patched.get(kind, {}))) - known
+            if missing:
+                raise ValueError(f"{school}: {kind} not found in catalog: {sorted(missing)}")
+
+            clashes = {i for i in added_ids if i in base_ids or added_ids.count(i) > 1}
+            if clashes:
+                raise ValueError(f"{school}: added {kind} reuse existing ids: {sorted(clashes)}")
+
+            for rid, fields in self.overlay.patched.get(kind, {}).items():
+                if "id" in fields:
+                    raise ValueError(f"{school}: patch for {kind} '{rid}' may not change 'id'")
+                bad = set(fields) - PATCHABLE_FIELDS[kind]
+                if bad:
+                    raise ValueError(f"{school}: patch for {kind} '{rid}' has unknown field(s): {sorted(bad)}")
+
+            for r in self.overlay.added.get(kind, ()):
+                problem = _record_problem(kind, r)
+                if problem:
+                    raise ValueError(f"{school}: added {kind} '{r['id']}': {problem}")
+
+            patch_targets = dict(base_ids)
+            patch_targets.update((r["id"], r) for r in self.overlay.added.get(kind, ()))
+            for rid, fields in self.overlay.patched.get(kind, {}).items():
+                problem = _record_problem(kind, {**patch_targets[rid], **fields})
+                if problem:
+                    raise ValueError(f"{school}: patch for {kind} '{rid}': {problem}")
+
+    def _resolve(self, kind: str) -> Tuple[Record, ...]:
+        if kind in self._resolved:
+            return self._resolved[kind]
+
+        if self.overlay.is_empty(kind):
+            out = self.base.records(kind)   # no copy at all
+        else:
+            disabled = self.overlay.disabled.get(kind, frozenset())
+            patches = self.overlay.patched.get(kind, {})
+            merged: List[Record] = []
+            for r in self.base.records(kind) + self.overlay.added.get(kind, ()):
+                if r["id"] in disabled:
+                    continue
+                patch = patches.get(r["id"])
+                # patch values are already frozen, so a shallow proxy is enough
+                merged.append(MappingProxyType({**r, **patch}) if patch else r)
+            out = tuple(merged)
+
+        self._resolved[kind] = out
+        return out
+
+    def records(self, kind: str) -> Tuple[Record, ...]:
+        return self._resolve(kind)
+
+    def index(self, kind: str) -> Mapping[str, Record]:
+        if kind not in self._index:
+            if self.overlay.is_empty(kind):
+                self._index[kind] = self.base.index(kind)
+            else:
+                self._index[kind] = MappingProxyType({r["id"]: r for r in self._resolve(kind)})
+        return self._index[kind]
+
+    def get(self, kind: str, record_id: str) -> Optional[Record]:
+        return self.index(kind).get(record_id)
+
+    def games(self) -> Tuple[Record, ...]:
+        return self.records("games")
+
+    def careers(self) -> Tuple[Record, ...]:
+        return self.records("careers")
+
+    def videos(self) -> Tuple[Record, ...]:
+        return self.records("videos")
+
+    def recommend(self, user: Dict[str, Any]) -> Dict[str, Any]:
+        return get_recommendations_for_user(user, list(self.games()), list(self.careers()), list(self.videos()))
+
+
+# 4. Registry: one base, many schools
+class CatalogRegistry:
+    """
+    Hands out one cached LayeredCatalog per school. Only registered schools
+    are served; a school with no changes registers an empty overlay.
+    for_school(None) returns the plain base view.
+    """
+
+    def __init__(self, base: Optional[CatalogBase] = None):
+        self.base = base or CatalogBase.from_loaders()
+        self._overlays: Dict[str, CatalogOverlay] = {}
+        self._catalogs: Dict[str, LayeredCatalog] = {}
+        self._default = LayeredCatalog(self.base)
+
+    @classmethod
+    def from_dir(cls, overlays_dir: Path = OVERLAYS_DIR, base: Optional[CatalogBase] = None) -> "CatalogRegistry":
+        registry = cls(base)
+        if overlays_dir.exists():
+            for p in sorted(overlays_dir.glob("*.json")):
+                registry.register(load_overlay(p))
+        return registry
+
+    def register(self, overlay: CatalogOverlay) -> LayeredCatalog:
+        catalog = LayeredCatalog(self.base, overlay)   # validates before replacing
+        self._overlays[overlay.school_id] = overlay
+        self._catalogs[overlay.school_id] = catalog
+        return catalog
+
+    def unregister(self, school_id: str):
+        self._overlays.pop(school_id, None)
+        self._catalogs.pop(school_id, None)
+
+    def for_school(self, school_id: Optional[str]) -> LayeredCatalog:
+        if school_id is None:
+            return self._default
+        try:
+            return self._catalogs[school_id]
+        except KeyError:
+            raise KeyError(f"no catalog overlay registered for school '{school_id}'") from None
+
+    def schools(self) -> List[str]:
+        return sorted(self._overlays)
+
+
+# 5. Entry point
+if __name__ == "__main__":
+    registry = CatalogRegistry.from_dir()
+    print("base:", {k: len(registry.base.records(k)) for k in KINDS})
+    for sid in registry.schools():
+        cat = registry.for_school(sid)
+        print(sid + ":", json.dumps({k: len(cat.records(k)) for k in KINDS}))
+        print(json.dumps(thaw(cat.records("careers")[0]), indent=2, ensure_ascii=False))
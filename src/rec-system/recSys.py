@@ -116,23 +116,24 @@ def load_users() -> List[Dict[str, Any]]:
 def load_games_as_units() -> List[Dict[str, Any]]:
     raw = load_json(P_GAMES)
     games = raw["games"] if isinstance(raw, dict) and "games" in raw else raw
-    units: List[Dict[str, Any]] = []
-    for g in games:
-        pe = g.get("progress_effects") or {}
-        pe_kn = pe.get("knowledge") or {}
-        node_id = pe_kn.get("node") or g.get("node_id") or g.get("code")
-        knowledge_nodes = []
-        if node_id:
-            knowledge_nodes.append({"id": node_id, "weight": 1.0})
-        units.append({
-            "id": g.get("id"),
-            "title": g.get("title", g.get("id")),
-            "kind": "game",
-            "difficulty": parse_difficulty(g.get("difficulty", 1)),
-            "knowledge_nodes": knowledge_nodes,
-            "progress_effects": g.get("progress_effects", {}),
-        })
-    return units
+    return [game_to_unit(g) for g in games]
+
+
+def game_to_unit(g: Dict[str, Any]) -> Dict[str, Any]:
+    pe = g.get("progress_effects") or {}
+    pe_kn = pe.get("knowledge") or {}
+    node_id = pe_kn.get("node") or g.get("node_id") or g.get("code")
+    knowledge_nodes = []
+    if node_id:
+        knowledge_nodes.append({"id": node_id, "weight": 1.0})
+    return {
+        "id": g.get("id"),
+        "title": g.get("title", g.get("id")),
+        "kind": "game",
+        "difficulty": parse_difficulty(g.get("difficulty", 1)),
+        "knowledge_nodes": knowledge_nodes,
+        "progress_effects": g.get("progress_effects", {}),
+    }
 
 
 # 5. Load videos: discipline_videos.json (kept separate from units, recommended independently)
@@ -142,25 +143,25 @@ def load_videos() -> List[Dict[str, Any]]:
         arr = raw["videos"]
     else:
         arr = raw if isinstance(raw, list) else []
-    videos: List[Dict[str, Any]] = []
-    for idx, v in enumerate(arr, start=1):
-        if isinstance(v, dict):
-            videos.append({
-                "id": v.get("id") or f"video-{idx}",
-                "title": v.get("title", f"Scientist video {idx}"),
-                "discipline": v.get("discipline"),
-                "career_id": v.get("career_id"),
-                "video_url": v.get("video_url"),
-            })
-        else:
-            videos.append({
-                "id": f"video-{idx}",
-                "title": str(v),
-                "discipline": None,
-                "career_id": None,
-                "video_url": None,
-            })
-    return videos
+    return [normalize_video(v, idx) for idx, v in enumerate(arr, start=1)]
+
+
+def normalize_video(v: Any, idx: int) -> Dict[str, Any]:
+    if isinstance(v, dict):
+        return {
+            "id": v.get("id") or f"video-{idx}",
+            "title": v.get("title", f"Scientist video {idx}"),
+            "discipline": v.get("discipline"),
+            "career_id": v.get("career_id"),
+            "video_url": v.get("video_url"),
+        }
+    return {
+        "id": f"video-{idx}",
+        "title": str(v),
+        "discipline": None,
+        "career_id": None,
+        "video_url": None,
+    }
 
 
 # 6. Load careers: now only use STEM Careers.json
@@ -175,17 +176,18 @@ def load_careers() -> List[Dict[str, Any]]:
     raw = load_json(P_CAREERS_2)  # Only use STEM Careers.json
     arr = raw["careers"] if isinstance(raw, dict) and "careers" in raw else raw
 
-    careers: List[Dict[str, Any]] = []
-    for c in arr:
-        careers.append({
-            "id": c.get("id") or c.get("career_id"),
-            "title": c.get("title") or c.get("name"),
-            "min_skill_levels": c.get("min_skill_levels", {}),
-            "required_knowledge": c.get("required_knowledge", []),
-            "threshold": c.get("threshold", 0),
-            "discipline": c.get("discipline"),
-        })
-    return careers
+    return [normalize_career(c) for c in arr]
+
+
+def normalize_career(c: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": c.get("id") or c.get("career_id"),
+        "title": c.get("title") or c.get("name"),
+        "min_skill_levels": c.get("min_skill_levels", {}),
+        "required_knowledge": c.get("required_knowledge", []),
+        "threshold": c.get("threshold", 0),
+        "discipline": c.get("discipline"),
+    }
 
 
 # 7. User helpers & unit selection